@@ -17,47 +17,48 @@ from typing import List
 from vbchart import VerticalBarChart
 
 
-def make_sample_values(
-    n: int = 100,
+def make_waveform(n: int = 100) -> List[float]:
+    """
+    Deterministic, non-random signal in [-1, 1].
+
+    Parameters:
+      n    : number of values
+
+    Scale it into a value range with scale_samples().
+    """
+    sin = math.sin
+    idx = range(n)
+
+    # base waveform in approximately [-1, 1]
+    w = [0.65 * sin(i * 0.22) + 0.35 * sin(i * 0.07 + 1.2) for i in idx]
+
+    # gentle ramp in roughly [-0.25, 0.25]
+    ramp = [((i % 40) - 20) / 80.0 for i in idx]
+
+    # combine and clamp to [-1, 1]
+    return [max(-1.0, min(1.0, a + b)) for a, b in zip(w, ramp)]
+
+
+def scale_samples(
+    wave: List[float],
     vmin: float = -100.0,
     vmax: float = 100.0,
 ) -> List[float]:
     """
-    Deterministic, non-random signal generator.
+    Scale a waveform in [-1, 1] into [vmin, vmax].
 
     Parameters:
-      n    : number of values
+      wave : values from make_waveform()
       vmin : minimum output value
       vmax : maximum output value
-
-    Produces a smooth signal, scaled and clamped into [vmin, vmax].
     """
     if vmax <= vmin:
         raise ValueError("vmax must be greater than vmin")
 
-    span = vmax - vmin
     mid = (vmax + vmin) / 2.0
+    half_span = (vmax - vmin) / 2.0
 
-    out: List[float] = []
-    for i in range(n):
-        # base waveform in approximately [-1, 1]
-        w = (
-            0.65 * math.sin(i * 0.22) +
-            0.35 * math.sin(i * 0.07 + 1.2)
-        )
-
-        # gentle ramp in roughly [-0.25, 0.25]
-        ramp = ((i % 40) - 20) / 80.0
-
-        # combine and clamp to [-1, 1]
-        x = max(-1.0, min(1.0, w + ramp))
-
-        # scale into [vmin, vmax]
-        v = mid + x * (span / 2.0)
-
-        out.append(v)
-
-    return out
+    return [mid + v * half_span for v in wave]
 
 
 def heatmap_sgr(v: float, vmax: float) -> str:
@@ -86,7 +87,10 @@ def heatmap_sgr(v: float, vmax: float) -> str:
 
 def main() -> None:
     # ---------------- Mixed-sign data ----------------
-    values = make_sample_values(100, -100, 100)
+    # One waveform, scaled into each range the demos need
+    wave = make_waveform(100)
+
+    values = scale_samples(wave, -100, 100)
 
     print(VerticalBarChart(
         values,
@@ -121,12 +125,9 @@ def main() -> None:
     styled.SetLabelSgr("38;5;252")
     styled.SetAxisSgr("38;5;244")
     styled.SetBarSgr("38;5;39")
+    styled.SetSpaceSgr("38;5;238")
 
     def value2sgr(**ctx):
-        glyph = ctx["glyph"]
-        if glyph == " ":
-            return "38;5;238"
-
         vl = float(ctx["value_left"])
         vr = float(ctx["value_right"])
 
@@ -147,7 +148,7 @@ def main() -> None:
     # ---------------- Positive-only data ----------------
     print()
 
-    pos_values = make_sample_values(100, 0, 100)
+    pos_values = scale_samples(wave, 0, 100)
 
     print(VerticalBarChart(
         pos_values,
@@ -161,7 +162,7 @@ def main() -> None:
     # ---------------- Negative-only data ----------------
     print()
 
-    neg_values = make_sample_values(100, -100, 0)
+    neg_values = scale_samples(wave, -100, 0)
 
     print(VerticalBarChart(
         neg_values,
@@ -187,12 +188,9 @@ def main() -> None:
     hi_contrast.SetBorder(True, sgr="1;38;5;196", charset="double")
     hi_contrast.SetAxisSgr("38;5;88")
     hi_contrast.SetBarSgr("38;5;39")
+    hi_contrast.SetSpaceSgr("38;5;250")
 
     def hi_contrast_heat(**ctx):
-        glyph = ctx["glyph"]
-        if glyph == " ":
-            return "38;5;250"
-
         vl = float(ctx["value_left"])
         vr = float(ctx["value_right"])
 
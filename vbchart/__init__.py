@@ -2,48 +2,51 @@ from __future__ import annotations
 
 import re
 from dataclasses import dataclass
+from functools import lru_cache
 from shutil import get_terminal_size
-from typing import Callable, Iterable, Optional, Union
+from types import MappingProxyType
+from typing import Callable, Iterable, Mapping, Optional, Union
 import math
 
 Number = Union[int, float]
 
+_ANSI_RE = re.compile(r'\x1b\[[0-?]*[ -/]*[@-~]')  # any ECMA-48 CSI, incl. colon-form SGR
+
+
 class AnsiHelp:
-    _ANSI_RE = re.compile(r'\x1b\[[0-9;]*[A-Za-z]')
+    _ANSI_RE = _ANSI_RE
 
     @staticmethod
     def truncate_visible(s: str, max_cols: int) -> str:
         """
         Truncate to max_cols *visible* characters,
         preserving ANSI escape sequences.
-        Never splits an escape code.
+        Never splits an escape code; output stops at an unterminated ESC[.
         """
         if max_cols <= 0:
             return ""
 
         out = []
-        vis = 0
-        i = 0
-        n = len(s)
-
-        while i < n and vis < max_cols:
-            if s[i] == '\x1b' and i + 1 < n and s[i + 1] == '[':
-                # copy the whole SGR sequence
-                j = i + 2
-                while j < n and s[j] != 'm':
-                    j += 1
-                if j < n:
-                    j += 1  # include 'm'
-                    out.append(s[i:j])
-                    i = j
-                    continue
-                # malformed escape; stop safely
-                break
+        remaining = max_cols
+        pos = 0
 
-            out.append(s[i])
-            vis += 1
-            i += 1
+        # Copy whole runs of visible text between escapes, not one char at a time.
+        for m in _ANSI_RE.finditer(s):
+            text = s[pos:m.start()]
+            if len(text) >= remaining or '\x1b[' in text:
+                break
+            out.append(text)
+            remaining -= len(text)
+            out.append(m.group(0))
+            pos = m.end()
+        else:
+            text = s[pos:]
 
+        # A dangling ESC[ without its terminator is malformed; stop safely.
+        k = text.find('\x1b[')
+        if k >= 0:
+            text = text[:k]
+        out.append(text[:remaining])
         return "".join(out)
 
     @staticmethod
@@ -61,6 +64,35 @@ class AnsiHelp:
 ValueColorCallback = Callable[..., Optional[str]]
 
 
+@lru_cache(maxsize=1)
+def _cached_term_cols() -> int:
+    """
+    Terminal width, queried once and reused until refresh_terminal_width().
+    """
+    return get_terminal_size(fallback=(80, 24)).columns
+
+
+def refresh_terminal_width() -> None:
+    """
+    Forget the cached terminal width; the next chart rendered without
+    an explicit width queries the terminal again (e.g. after a resize).
+    """
+    _cached_term_cols.cache_clear()
+
+
+# Glyph tables indexed by l_steps * 3 + r_steps, each side in 0..2 (0/5/10% of a band).
+_POS_GLYPHS = (' ', '▗', '▐', '▖', '▄', '▟', '▌', '▙', '█')
+_NEG_GLYPHS = (' ', '▝', '▐', '▘', '▀', '▜', '▌', '▛', '█')
+_ASCII_GLYPHS = (' ', 'R', 'R', 'L', '#', '#', 'L', '#', '#')
+
+# Border charsets by SetBorder(charset=...); read-only so every chart can share them.
+_BORDER_CHARS: Mapping[str, Mapping[str, str]] = {
+    'single': MappingProxyType({'tl': '┌', 'tr': '┐', 'bl': '└', 'br': '┘', 'h': '─', 'v': '│'}),
+    'double': MappingProxyType({'tl': '╔', 'tr': '╗', 'bl': '╚', 'br': '╝', 'h': '═', 'v': '║'}),
+    'ascii': MappingProxyType({'tl': '+', 'tr': '+', 'bl': '+', 'br': '+', 'h': '-', 'v': '|'}),
+}
+
+
 @dataclass
 class VerticalBarChart:
     """
@@ -71,6 +103,8 @@ class VerticalBarChart:
 
     Styling is applied AFTER construction via Set*() methods.
     Caller supplies raw SGR parameter strings; chart only wraps them.
+    SetSpaceSgr() styles empty (' ') bar cells directly: they never reach
+    the value callback, and without a callback it overrides SetBarSgr() for them.
 
     Glyph semantics per 10% band cell (each side is 0/5/10 within that band):
       Positive (bottom-filled):
@@ -107,6 +141,7 @@ class VerticalBarChart:
     _label_sgr: Optional[str] = None    # Y-axis labels (and title if you want to reuse)
     _axis_sgr: Optional[str] = None     # baseline / zero line
     _bar_sgr: Optional[str] = None      # default for bar glyphs
+    _space_sgr: Optional[str] = None    # empty (' ') bar cells; bypasses the value callback
 
     _value_color_cb: Optional[ValueColorCallback] = None
 
@@ -130,6 +165,10 @@ class VerticalBarChart:
         self._bar_sgr = sgr
         return self
 
+    def SetSpaceSgr(self, sgr: Optional[str]) -> 'VerticalBarChart':
+        self._space_sgr = sgr
+        return self
+
     def SetValueColorCallback(self, cb: Optional[ValueColorCallback]) -> 'VerticalBarChart':
         self._value_color_cb = cb
         return self
@@ -139,60 +178,28 @@ class VerticalBarChart:
     def _term_cols(self) -> int:
         if self.width is not None:
             return max(20, int(self.width))
-        return max(20, get_terminal_size(fallback=(80, 24)).columns)
-
-    @staticmethod
-    def _clamp_int(x: int, lo: int, hi: int) -> int:
-        return lo if x < lo else hi if x > hi else x
+        return max(20, _cached_term_cols())
 
-    def _to_signed_steps_5pct(self, value: float, denom: float) -> int:
+    def _to_signed_steps_5pct(self, values: list[float], denom: float) -> list[int]:
+        """
+        Convert all values to signed 5% steps [-20..20] in one call.
+        """
         if denom <= 0:
-            return 0
-        pct = (value / denom) * 100.0
+            return [0] * len(values)
+        pcts = [(v / denom) * 100.0 for v in values]
         if self.clamp_to_100:
-            pct = max(-100.0, min(100.0, pct))
-        steps = int(round(pct / 5.0))
-        return self._clamp_int(steps, -20, 20)
-
-    def _glyph_pos(self, l_steps: int, r_steps: int) -> str:
-        if not self.unicode:
-            l_on, r_on = l_steps > 0, r_steps > 0
-            if l_on and r_on: return '#'
-            if l_on: return 'L'
-            if r_on: return 'R'
-            return ' '
-        table = {
-            (0, 0): ' ',
-            (0, 1): '▗',
-            (0, 2): '▐',
-            (1, 0): '▖',
-            (1, 1): '▄',
-            (1, 2): '▟',
-            (2, 0): '▌',
-            (2, 1): '▙',
-            (2, 2): '█',
-        }
-        return table[(l_steps, r_steps)]
-
-    def _glyph_neg(self, l_steps: int, r_steps: int) -> str:
-        if not self.unicode:
-            l_on, r_on = l_steps > 0, r_steps > 0
-            if l_on and r_on: return '#'
-            if l_on: return 'L'
-            if r_on: return 'R'
-            return ' '
-        table = {
-            (0, 0): ' ',
-            (0, 1): '▝',
-            (0, 2): '▐',
-            (1, 0): '▘',
-            (1, 1): '▀',
-            (1, 2): '▜',
-            (2, 0): '▌',
-            (2, 1): '▛',
-            (2, 2): '█',
-        }
-        return table[(l_steps, r_steps)]
+            # min/max (not a conditional) so NaN pcts, e.g. from inf data, clamp to 100 instead of reaching round()
+            pcts = [max(-100.0, min(100.0, p)) for p in pcts]
+        steps = [round(p / 5.0) for p in pcts]  # round() without ndigits already returns int
+        return [-20 if st < -20 else 20 if st > 20 else st for st in steps]
+
+    def _row_glyph_indices(self, lmags: list[int], rmags: list[int], steps_below: int) -> list[int]:
+        """
+        Glyph table index (l_in_row * 3 + r_in_row) for every column of one band row.
+        """
+        l_in_row = [0 if d < 0 else 2 if d > 2 else d for d in (lm - steps_below for lm in lmags)]
+        r_in_row = [0 if d < 0 else 2 if d > 2 else d for d in (rm - steps_below for rm in rmags)]
+        return [li * 3 + ri for li, ri in zip(l_in_row, r_in_row)]
 
     def _default_forced_fmt(self) -> str:
         # trailing space is intentional (your preference)
@@ -226,9 +233,13 @@ class VerticalBarChart:
         denom: float,
         row_kind: str,   # 'pos'|'neg'
         row: int,        # 1..10 band index (pos: 10..1, neg: 1..N)
+        wrap_cache: dict[tuple[Optional[str], str], str],
     ) -> str:
-        # If callback exists, it wins.
-        if self._value_color_cb is not None:
+        # Only reached with a value callback; otherwise __str__ pre-wraps the glyph tables.
+        # Empty cells never reach the callback once a space sgr is set.
+        if glyph == ' ' and self._space_sgr is not None:
+            sgr = self._space_sgr
+        else:
             pct_left = (value_left / denom) if denom else 0.0
             pct_right = (value_right / denom) if denom else 0.0
             sgr = self._value_color_cb(
@@ -240,18 +251,17 @@ class VerticalBarChart:
                 row=row,
                 glyph=glyph,
             )
-            return AnsiHelp._sgr_wrap(sgr, glyph)
 
-        # Otherwise default bar sgr.
-        return AnsiHelp._sgr_wrap(self._bar_sgr, glyph)
+        # Few distinct (sgr, glyph) pairs occur per chart; wrap each only once.
+        key = (sgr, glyph)
+        cached = wrap_cache.get(key)
+        if cached is None:
+            cached = wrap_cache[key] = AnsiHelp._sgr_wrap(sgr, glyph)
+        return cached
 
-    def _border_chars(self) -> dict[str, str]:
-        if self._border_style_name == 'double':
-            return {'tl': '╔', 'tr': '╗', 'bl': '╚', 'br': '╝', 'h': '═', 'v': '║'}
-        if self._border_style_name == 'ascii':
-            return {'tl': '+', 'tr': '+', 'bl': '+', 'br': '+', 'h': '-', 'v': '|'}
+    def _border_chars(self) -> Mapping[str, str]:
         # default: single
-        return {'tl': '┌', 'tr': '┐', 'bl': '└', 'br': '┘', 'h': '─', 'v': '│'}
+        return _BORDER_CHARS.get(self._border_style_name, _BORDER_CHARS['single'])
 
     @staticmethod
     def _visible_len(s: str) -> int:
@@ -259,19 +269,9 @@ class VerticalBarChart:
         Approximate visible width by stripping ANSI escapes.
         Good enough for borders here (we only add escapes, not wide glyphs).
         """
-        out = []
-        i = 0
-        while i < len(s):
-            if s[i] == '\x1b' and i + 1 < len(s) and s[i + 1] == '[':
-                # consume until 'm' (SGR)
-                i += 2
-                while i < len(s) and s[i] != 'm':
-                    i += 1
-                i += 1  # skip 'm'
-                continue
-            out.append(s[i])
-            i += 1
-        return len("".join(out))
+        if '\x1b' not in s:
+            return len(s)
+        return len(_ANSI_RE.sub('', s))
 
     def _add_border(self, lines: list[str]) -> list[str]:
         if not self._border_enabled or not lines:
@@ -279,27 +279,27 @@ class VerticalBarChart:
 
         cs = self._border_chars()
 
-        content_w = max(self._visible_len(ln) for ln in lines)
+        vis_lens = [self._visible_len(ln) for ln in lines]
+        content_w = max(vis_lens)
 
         def B(text: str) -> str:
             return AnsiHelp._sgr_wrap(self._border_sgr, text)
 
         # Top / bottom are easiest: wrap the entire line in border SGR.
-        top_plain = cs['tl'] + cs['h'] * (content_w + 2) + cs['tr']
-        bot_plain = cs['bl'] + cs['h'] * (content_w + 2) + cs['br']
-        out = [B(top_plain)]
+        horiz = cs['h'] * (content_w + 2)
+        out = [B(cs['tl'] + horiz + cs['tr'])]
 
         # Sides: wrap only the border glyphs, never the interior.
-        left_v = B(cs['v'])
-        right_v = B(cs['v'])
+        side_v = B(cs['v'])
+        left_v = side_v + ' '
+        right_v = ' ' + side_v
 
-        for ln in lines:
-            pad = content_w - self._visible_len(ln)
-            # IMPORTANT: pad is *visible* padding;
-            #            ln already contains any ANSI it needs.
-            out.append(f'{left_v} {ln}{' ' * pad} {right_v}')
+        for ln, vis_len in zip(lines, vis_lens):
+            # IMPORTANT: pad to *visible* width;
+            #            ln already contains any ANSI it needs, so ljust past len(ln).
+            out.append(left_v + ln.ljust(len(ln) + content_w - vis_len) + right_v)
 
-        out.append(B(bot_plain))
+        out.append(B(cs['bl'] + horiz + cs['br']))
         return out
 
     # ------------- Rendering -------------
@@ -311,21 +311,22 @@ class VerticalBarChart:
 
         cols = self._term_cols()
 
-        denom = float(self.max_value) if self.max_value is not None else max(abs(v) for v in vals)
+        denom = float(self.max_value) if self.max_value is not None else max(map(abs, vals))
         if denom <= 0:
             denom = 1.0
 
-        # Pack sequentially into (left,right)
-        left_vals: list[float] = []
-        right_vals: list[float] = []
-        it = iter(vals)
-        for a in it:
-            left_vals.append(a)
-            right_vals.append(next(it, 0.0))
+        # Pack sequentially into (left,right); an odd trailing value pairs with 0.0
+        left_vals = vals[0::2]
+        right_vals = vals[1::2]
+        if len(vals) % 2:
+            right_vals.append(0.0)
 
-        # Convert to signed steps [-20..20]
-        left_steps_total = [self._to_signed_steps_5pct(v, denom) for v in left_vals]
-        right_steps_total = [self._to_signed_steps_5pct(v, denom) for v in right_vals]
+        # Convert to signed steps [-20..20], packed the same way
+        steps_total = self._to_signed_steps_5pct(vals, denom)
+        left_steps_total = steps_total[0::2]
+        right_steps_total = steps_total[1::2]
+        if len(steps_total) % 2:
+            right_steps_total.append(0)
 
         # Minimal negative rows
         max_neg_steps = 0
@@ -336,14 +337,23 @@ class VerticalBarChart:
 
         forced_labels = (self.max_value is not None) or (self.y_label_fmt is not None)
 
-        # Compute y-axis width from labels we will render
+        # Render y-axis labels once (pos: rows 10..1, neg: rows 1..N); y-axis width follows from them
         y_w = 0
+        pos_labels: list[str] = []
+        neg_labels: list[str] = []
+        zero_label = ''
         if self.show_y_axis:
-            labels = [self._render_y_label(kind='pos', row=r, denom=denom, forced=forced_labels) for r in range(10, 0, -1)]
+            pos_labels = [self._render_y_label(kind='pos', row=r, denom=denom, forced=forced_labels) for r in range(10, 0, -1)]
+            labels = list(pos_labels)
             if neg_rows > 0:
-                labels.append(self._render_y_label(kind='zero', row=0, denom=denom, forced=forced_labels))
-                labels.extend(self._render_y_label(kind='neg', row=r, denom=denom, forced=forced_labels) for r in range(1, neg_rows + 1))
+                zero_label = self._render_y_label(kind='zero', row=0, denom=denom, forced=forced_labels)
+                neg_labels = [self._render_y_label(kind='neg', row=r, denom=denom, forced=forced_labels) for r in range(1, neg_rows + 1)]
+                labels.append(zero_label)
+                labels.extend(neg_labels)
             y_w = max(len(s) for s in labels)
+            pos_labels = [AnsiHelp._sgr_wrap(self._label_sgr, lbl.rjust(y_w)) for lbl in pos_labels]
+            neg_labels = [AnsiHelp._sgr_wrap(self._label_sgr, lbl.rjust(y_w)) for lbl in neg_labels]
+            zero_label = AnsiHelp._sgr_wrap(self._label_sgr, zero_label.rjust(y_w))
 
         # Fit columns (1 glyph per packed column)
         usable = cols - y_w
@@ -364,31 +374,56 @@ class VerticalBarChart:
                 rule = ('─' if self.unicode else '-') * min(cols, max(10, len(self.title)))
                 lines.append(AnsiHelp._sgr_wrap(self._axis_sgr, rule))
 
+        # Without a callback every cell is one of 9 glyphs in the bar sgr; wrap them up front.
+        wrap_cache: dict[tuple[Optional[str], str], str] = {}
+        pos_cells: Optional[tuple[str, ...]] = None
+        neg_cells: Optional[tuple[str, ...]] = None
+        pos_glyphs = _POS_GLYPHS if self.unicode else _ASCII_GLYPHS
+        neg_glyphs = _NEG_GLYPHS if self.unicode else _ASCII_GLYPHS
+        if self._value_color_cb is None:
+            space_sgr = self._space_sgr if self._space_sgr is not None else self._bar_sgr
+            pos_cells = tuple(AnsiHelp._sgr_wrap(space_sgr if g == ' ' else self._bar_sgr, g) for g in pos_glyphs)
+            neg_cells = tuple(AnsiHelp._sgr_wrap(space_sgr if g == ' ' else self._bar_sgr, g) for g in neg_glyphs)
+
+        # Per-column magnitudes above / below zero, shared by every row
+        lmag_pos = [s if s > 0 else 0 for s in left_steps_total]
+        rmag_pos = [s if s > 0 else 0 for s in right_steps_total]
+        lmag_neg = [-s if s < 0 else 0 for s in left_steps_total]
+        rmag_neg = [-s if s < 0 else 0 for s in right_steps_total]
+
+        cols_count = len(left_vals)
+
+        # Columns were fitted to cols - y_w, so rows only need truncating when the labels alone overflow.
+        rows_fit = y_w + cols_count <= cols
+
+        def fit(line: str) -> str:
+            return line if rows_fit else AnsiHelp.truncate_visible(line, cols)
+
         # Positive region (10 rows)
         for row in range(10, 0, -1):
             steps_below = (row - 1) * 2
-            parts = []
+            lbl = pos_labels[10 - row] if self.show_y_axis else ''
 
-            if self.show_y_axis:
-                lbl = self._render_y_label(kind='pos', row=row, denom=denom, forced=forced_labels)
-                parts.append(AnsiHelp._sgr_wrap(self._label_sgr, lbl.rjust(y_w)))
-
-            for lv, rv, ls, rs in zip(left_vals, right_vals, left_steps_total, right_steps_total):
-                lmag = ls if ls > 0 else 0
-                rmag = rs if rs > 0 else 0
-                l_in_row = self._clamp_int(lmag - steps_below, 0, 2)
-                r_in_row = self._clamp_int(rmag - steps_below, 0, 2)
-                glyph = self._glyph_pos(l_in_row, r_in_row)
-                parts.append(self._style_cell(
-                    glyph=glyph,
+            idxs = self._row_glyph_indices(lmag_pos, rmag_pos, steps_below)
+            if pos_cells is not None:
+                lines.append(fit(lbl + "".join([pos_cells[idx] for idx in idxs])))
+                continue
+
+            # Callback rows are [label, cell, cell, ...], filled by index.
+            row_parts = [''] * (cols_count + 1)
+            row_parts[0] = lbl
+            for i, (lv, rv, idx) in enumerate(zip(left_vals, right_vals, idxs), 1):
+                row_parts[i] = self._style_cell(
+                    glyph=pos_glyphs[idx],
                     value_left=lv,
                     value_right=rv,
                     denom=denom,
                     row_kind='pos',
                     row=row,
-                ))
+                    wrap_cache=wrap_cache,
+                )
 
-            lines.append(AnsiHelp.truncate_visible("".join(parts), cols))
+            lines.append(fit("".join(row_parts)))
 
         # Negative portion: either baseline only, or 0-axis + rows
         axis_char = '─' if self.unicode else '-'
@@ -396,42 +431,41 @@ class VerticalBarChart:
             # 0 axis
             parts = []
             if self.show_y_axis:
-                lbl0 = self._render_y_label(kind='zero', row=0, denom=denom, forced=forced_labels)
-                parts.append(AnsiHelp._sgr_wrap(self._label_sgr, lbl0.rjust(y_w)))
+                parts.append(zero_label)
             parts.append(AnsiHelp._sgr_wrap(self._axis_sgr, axis_char * len(left_vals)))
-            lines.append(AnsiHelp.truncate_visible("".join(parts), cols))
+            lines.append(fit("".join(parts)))
 
             # negative rows: -10 .. -neg_rows*10
             for row in range(1, neg_rows + 1):
                 steps_below = (row - 1) * 2
-                parts = []
-                if self.show_y_axis:
-                    lbl = self._render_y_label(kind='neg', row=row, denom=denom, forced=forced_labels)
-                    parts.append(AnsiHelp._sgr_wrap(self._label_sgr, lbl.rjust(y_w)))
-
-                for lv, rv, ls, rs in zip(left_vals, right_vals, left_steps_total, right_steps_total):
-                    lmag = (-ls) if ls < 0 else 0
-                    rmag = (-rs) if rs < 0 else 0
-                    l_in_row = self._clamp_int(lmag - steps_below, 0, 2)
-                    r_in_row = self._clamp_int(rmag - steps_below, 0, 2)
-                    glyph = self._glyph_neg(l_in_row, r_in_row)
-                    parts.append(self._style_cell(
-                        glyph=glyph,
+                lbl = neg_labels[row - 1] if self.show_y_axis else ''
+
+                idxs = self._row_glyph_indices(lmag_neg, rmag_neg, steps_below)
+                if neg_cells is not None:
+                    lines.append(fit(lbl + "".join([neg_cells[idx] for idx in idxs])))
+                    continue
+
+                row_parts = [''] * (cols_count + 1)
+                row_parts[0] = lbl
+                for i, (lv, rv, idx) in enumerate(zip(left_vals, right_vals, idxs), 1):
+                    row_parts[i] = self._style_cell(
+                        glyph=neg_glyphs[idx],
                         value_left=lv,
                         value_right=rv,
                         denom=denom,
                         row_kind='neg',
                         row=row,
-                    ))
+                        wrap_cache=wrap_cache,
+                    )
 
-                lines.append(AnsiHelp.truncate_visible("".join(parts), cols))
+                lines.append(fit("".join(row_parts)))
         else:
             # positive-only baseline at bottom
             parts = []
             if self.show_y_axis:
                 parts.append(' ' * y_w)
             parts.append(AnsiHelp._sgr_wrap(self._axis_sgr, axis_char * len(left_vals)))
-            lines.append(AnsiHelp.truncate_visible("".join(parts), cols))
+            lines.append(fit("".join(parts)))
 
         lines = self._add_border(lines)  # Add border last
 